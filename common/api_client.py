@@ -2,10 +2,18 @@
 # -*- coding: utf-8 -*-
 # @Description: API请求客户端封装
 
+import os
+import copy
 import json
 import requests
 from requests.exceptions import RequestException
 from common.logger import get_logger
+from common.stream_utils import DEFAULT_CHUNK_SIZE, MultipartStream, TransferStats, format_size
+
+# 记录响应体内容的最大字节数，超过时只记录大小
+LOG_BODY_MAX_BYTES = 1024 * 1024
+# 非JSON响应体日志截断长度
+LOG_TEXT_PREVIEW_CHARS = 1000
 
 
 class ApiClient:
@@ -33,6 +41,23 @@ class ApiClient:
         
         self.logger.info(f"API客户端初始化完成，base_url: {self.base_url}")
     
+    def clone(self):
+        """
+        复制客户端配置、请求头和cookie(如登录状态)，使用新的HTTP会话，不复用已建立的连接
+        :return: 新的ApiClient实例
+        """
+        client = copy.copy(self)
+        client.default_headers = self.default_headers.copy()
+        client.session = requests.Session()
+        client.session.headers = self.session.headers.copy()
+        client.session.cookies = self.session.cookies.copy()
+        client.session.auth = self.session.auth
+        client.session.params = dict(self.session.params)
+        client.session.verify = self.session.verify
+        client.session.cert = self.session.cert
+        client.session.proxies = dict(self.session.proxies)
+        return client
+    
     def _build_url(self, endpoint):
         """
         构建完整的URL
@@ -57,30 +82,53 @@ class ApiClient:
         if params:
             self.logger.debug(f"查询参数: {params}")
         
-        if data:
+        if isinstance(data, MultipartStream):
+            # 流式请求体只记录大小，不读取内容
+            self.logger.debug(f"请求体: 流式multipart，大小 {format_size(data.length)}")
+        elif data:
             # 避免日志中记录敏感信息
             log_data = data.copy() if isinstance(data, dict) else data
             if isinstance(log_data, dict) and 'password' in log_data:
                 log_data['password'] = '******'
             self.logger.debug(f"请求体: {log_data}")
     
-    def _log_response(self, response):
+    def _log_response(self, response, stream=False):
         """
         记录响应日志
+        根据Content-Type和Content-Length决定是否记录响应体，流式响应从不读取响应体
+        :param response: 响应对象
+        :param stream: 是否为流式响应
         """
         self.logger.info(f"API响应: {response.status_code} {response.reason}")
         self.logger.debug(f"响应头: {response.headers}")
         
+        content_type = response.headers.get('Content-Type', '')
+        content_length = response.headers.get('Content-Length')
+        body_size = int(content_length) if content_length and content_length.isdigit() else None
+        
+        if stream:
+            self.logger.debug(f"响应体: 流式读取，大小 {format_size(body_size)}")
+            return
+        
+        if body_size is None:
+            body_size = len(response.content)
+        if body_size > LOG_BODY_MAX_BYTES:
+            self.logger.debug(f"响应体: 已省略 ({content_type or '未知类型'}, {format_size(body_size)})")
+            return
+        
         try:
             # 尝试解析JSON响应
             response_json = response.json()
             self.logger.debug(f"响应体: {json.dumps(response_json, ensure_ascii=False)}")
         except ValueError:
-            # 非JSON响应，记录文本内容
-            if len(response.text) > 1000:
-                self.logger.debug(f"响应体(截断): {response.text[:1000]}...")
+            # 非JSON响应，只解码需要记录的部分；UTF-8单个字符最多4字节，
+            # 多读1字节可保证内容超长时解码结果一定超过截断长度
+            preview = response.content[:LOG_TEXT_PREVIEW_CHARS * 4 + 1].decode(
+                response.encoding or 'utf-8', errors='replace')
+            if len(preview) > LOG_TEXT_PREVIEW_CHARS:
+                self.logger.debug(f"响应体(截断): {preview[:LOG_TEXT_PREVIEW_CHARS]}...")
             else:
-                self.logger.debug(f"响应体: {response.text}")
+                self.logger.debug(f"响应体: {preview}")
     
     def request(self, method, endpoint, headers=None, params=None, data=None, json_data=None, **kwargs):
         """
@@ -106,10 +154,14 @@ class ApiClient:
         
         # 设置超时
         kwargs.setdefault('timeout', self.timeout)
+        stream = kwargs.get('stream', False)
+        
+        # 流式请求体只能读取一次，不进行重试
+        retry_times = self.retry_times if self._is_replayable(data) else 1
         
         # 发送请求，支持重试
         response = None
-        for attempt in range(self.retry_times):
+        for attempt in range(retry_times):
             try:
                 response = self.session.request(
                     method=method,
@@ -123,14 +175,120 @@ class ApiClient:
                 break
             except RequestException as e:
                 self.logger.error(f"请求异常: {e}")
-                if attempt < self.retry_times - 1:
-                    self.logger.info(f"重试请求 ({attempt + 1}/{self.retry_times})")
+                if attempt < retry_times - 1:
+                    self.logger.info(f"重试请求 ({attempt + 1}/{retry_times})")
                 else:
                     raise
         
         # 记录响应日志
-        self._log_response(response)
+        self._log_response(response, stream=stream)
+        
+        return response
+    
+    @staticmethod
+    def _is_replayable(data):
+        """
+        判断请求体是否可以重复发送
+        :param data: 请求体
+        :return: 文件对象、生成器等只能读取一次的请求体返回False
+        """
+        return data is None or isinstance(data, (dict, list, tuple, str, bytes))
+    
+    def download(self, endpoint, dest=None, method='GET', chunk_size=DEFAULT_CHUNK_SIZE,
+                 hash_algo=None, progress_callback=None, **kwargs):
+        """
+        流式下载，按块写入文件或只计算摘要，不在内存中缓存完整响应体
+        :param endpoint: API端点路径
+        :param dest: 目标文件路径或可写的二进制文件对象，为None时不保存内容
+        :param method: HTTP方法，默认GET
+        :param chunk_size: 分块大小(字节)
+        :param hash_algo: 摘要算法名称，如'sha256'，为None时不计算
+        :param progress_callback: 进度回调，签名为 callback(transferred, total)
+        :param kwargs: 其他请求参数
+        :return: TransferStats对象
+        :raises requests.HTTPError: 响应状态码大于等于400时抛出
+        """
+        kwargs['stream'] = True
+        response = self.request(method, endpoint, **kwargs)
+        
+        content_length = response.headers.get('Content-Length')
+        stats = TransferStats(
+            total=int(content_length) if content_length and content_length.isdigit() else None,
+            hash_algo=hash_algo,
+            progress_callback=progress_callback
+        )
+        stats.status_code = response.status_code
+        
+        # 错误响应不写入目标文件，避免错误页面被当作导出文件
+        if response.status_code >= 400:
+            self.logger.error(f"下载失败: {response.status_code} {response.reason}")
+            response.close()
+            response.raise_for_status()
+        
+        try:
+            if isinstance(dest, (str, os.PathLike)):
+                stats.path = os.fspath(dest)
+                with open(stats.path, 'wb') as f:
+                    self._consume_stream(response, stats, chunk_size, f)
+            else:
+                self._consume_stream(response, stats, chunk_size, dest)
+        except BaseException:
+            # 传输中断时删除不完整的文件，避免被当作完整的导出文件
+            if stats.path and os.path.exists(stats.path):
+                os.remove(stats.path)
+            self.logger.error(f"下载中断: 已接收 {format_size(stats.transferred)}")
+            raise
+        finally:
+            response.close()
+        
+        stats.finish()
+        self.logger.info(f"下载完成: {stats.summary()}")
+        return stats
+    
+    @staticmethod
+    def _consume_stream(response, stats, chunk_size, writer=None):
+        """
+        按块读取流式响应
+        :param response: 流式响应对象
+        :param stats: TransferStats对象
+        :param chunk_size: 分块大小(字节)
+        :param writer: 可写的二进制文件对象，为None时丢弃内容
+        """
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if not chunk:
+                continue
+            if writer is not None:
+                writer.write(chunk)
+            stats.update(chunk)
+    
+    def upload(self, endpoint, files, fields=None, method='POST', chunk_size=DEFAULT_CHUNK_SIZE,
+               progress_callback=None, headers=None, **kwargs):
+        """
+        流式multipart上传，从文件对象或生成器按块读取，不在内存中拼接完整请求体
+        :param endpoint: API端点路径
+        :param files: 文件字段，dict形式 {name: (filename, source[, content_type])}，
+                      source可以是bytes、二进制文件对象或产生bytes的生成器
+        :param fields: 普通表单字段
+        :param method: HTTP方法，默认POST
+        :param chunk_size: 分块大小(字节)
+        :param progress_callback: 进度回调，签名为 callback(transferred, total)
+        :param headers: 请求头
+        :param kwargs: 其他请求参数
+        :return: 响应对象，上传统计信息可通过 response.transfer_stats 获取
+        """
+        stats = TransferStats(progress_callback=progress_callback)
+        body = MultipartStream(fields=fields, files=files, chunk_size=chunk_size, stats=stats)
+        
+        request_headers = {'Content-Type': body.content_type}
+        if headers:
+            request_headers.update(headers)
+        
+        response = self.request(method, endpoint, headers=request_headers, data=body, **kwargs)
         
+        stats.finish()
+        stats.status_code = response.status_code
+        response.transfer_stats = stats
+        self.logger.info(f"上传完成: {stats.summary()}")
         return response
     
     def get(self, endpoint, params=None, **kwargs):
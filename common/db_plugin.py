@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Description: 数据库级测试数据重置，会话开始时快照数据库，模块之间通过快照恢复或事务回滚重置
+
+import os
+import json
+
+import pytest
+
+from common.db_client import DbClient, PROJECT_ROOT
+from common.logger import get_logger
+from config.settings import load_config, current_env, PROD_ENV
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('db', '数据库测试数据重置')
+    group.addoption('--db', action='store_true', default=False,
+                    help='开启数据库fixture，会话开始时快照数据库，模块结束后重置')
+    group.addoption('--db-url', default=None,
+                    help='数据库连接串，默认使用配置项db_connection，PROD环境下必须显式指定，如 sqlite:///data/test.db')
+    group.addoption('--db-reset', choices=('restore', 'rollback', 'off'), default='restore',
+                    help='模块之间的重置方式: restore从快照恢复表数据，'
+                         'rollback回滚通过db fixture所做的修改，off不重置，默认restore')
+    group.addoption('--db-seed', default=None,
+                    help='种子数据JSON文件，格式为 {表名: [行数据, ...]}，在快照前批量插入')
+
+
+def load_seed_data(db, seed_file, batch_size=1000):
+    """
+    批量插入种子数据
+    :param db: DbClient实例
+    :param seed_file: 种子数据JSON文件路径
+    :param batch_size: 每批插入的行数
+    :return: 插入的总行数
+    """
+    if not os.path.isabs(seed_file):
+        seed_file = os.path.join(PROJECT_ROOT, seed_file)
+    with open(seed_file, encoding='utf-8') as f:
+        seed_data = json.load(f)
+    return sum(db.bulk_insert(table, rows, batch_size) for table, rows in seed_data.items())
+
+
+@pytest.fixture(scope="session")
+def db(request):
+    """
+    数据库客户端，会话开始时写入种子数据并创建快照，会话结束时恢复到写入种子数据前的状态并删除快照
+    未开启--db时跳过依赖该fixture的用例
+    :return: DbClient实例
+    """
+    options = request.config.option
+    if not options.db:
+        pytest.skip("未开启--db，跳过数据库相关用例")
+    # 快照恢复会清空并重新写入表数据，不允许误用生产环境配置的数据库
+    if current_env() == PROD_ENV and not options.db_url:
+        pytest.fail(f"当前环境为{PROD_ENV}，--db不会使用配置中的db_connection，确需执行时请通过--db-url显式指定数据库")
+
+    env_config = load_config()
+    url = options.db_url or env_config.get('db_connection')
+    if not url:
+        pytest.fail("开启--db时需要配置db_connection或指定--db-url")
+
+    client = DbClient(url, get_logger())
+    tables = [t.strip() for t in env_config.get('db_snapshot_tables', '').split(',') if t.strip()] or None
+    # 会话结束时恢复到的快照，写入种子数据前创建，避免种子数据在多次执行之间累积
+    session_snapshot = DbClient.DEFAULT_SNAPSHOT
+    if options.db_seed:
+        session_snapshot = 'session'
+        client.snapshot(tables, name=session_snapshot)
+        load_seed_data(client, options.db_seed)
+    # 模块之间恢复到写入种子数据后的状态
+    client.snapshot(tables)
+
+    yield client
+
+    client.restore(session_snapshot)
+    client.drop_snapshot()
+    client.close()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _db_module_reset(request):
+    """
+    模块结束后重置数据库
+    restore模式恢复快照，覆盖通过API产生的数据修改；
+    rollback模式将整个模块包在一个事务中，只能撤销通过db fixture所做的修改
+    """
+    options = request.config.option
+    if not options.db or options.db_reset == 'off':
+        yield
+        return
+
+    client = request.getfixturevalue('db')
+    if options.db_reset == 'rollback':
+        with client.transaction(rollback=True):
+            yield
+    else:
+        yield
+        client.restore()
+
+
+@pytest.fixture(scope="function")
+def db_transaction(db):
+    """
+    在事务中执行用例，结束后回滚用例通过db所做的修改
+    :return: DbClient实例
+    """
+    with db.transaction(rollback=True):
+        yield db
@@ -0,0 +1,270 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Description: 不稳定用例检测插件，失败用例立即隔离重跑，并在SQLite中记录历史计算不稳定分数
+
+import os
+import sqlite3
+from collections import defaultdict
+from datetime import datetime
+
+import pytest
+from _pytest.runner import call_and_report, show_test_item
+
+from common.logger import get_logger
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB_PATH = os.path.join(PROJECT_ROOT, 'reports', 'flaky_history.db')
+
+# 当前执行轮次，0表示首次执行，大于0表示重跑
+FLAKY_ATTEMPT_KEY = pytest.StashKey[int]()
+
+QUARANTINE_MARKER = 'flaky_quarantine'
+
+
+class FlakyHistory:
+    """
+    用例执行历史，保存在本地SQLite数据库中
+    不稳定分数 = 最近window次执行中"重跑后通过"或"结果与上次不同"的次数 / 执行次数
+    """
+
+    def __init__(self, db_path, window=20):
+        """
+        初始化历史数据库
+        :param db_path: SQLite数据库文件路径
+        :param window: 计算不稳定分数时使用的最近执行次数
+        """
+        db_dir = os.path.dirname(db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+        self.window = window
+        # 并行执行时多个进程会写同一个数据库，设置较长的锁等待时间
+        self.conn = sqlite3.connect(db_path, timeout=30)
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS test_runs ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+            'nodeid TEXT NOT NULL, '
+            'outcome TEXT NOT NULL, '
+            'attempts INTEGER NOT NULL, '
+            'duration REAL NOT NULL, '
+            'run_at TEXT NOT NULL)'
+        )
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_test_runs_nodeid ON test_runs (nodeid, id)')
+        self.conn.commit()
+
+    def record(self, results):
+        """
+        批量写入执行结果
+        :param results: [(nodeid, outcome, attempts, duration), ...]
+        """
+        if not results:
+            return
+        run_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with self.conn:
+            self.conn.executemany(
+                'INSERT INTO test_runs (nodeid, outcome, attempts, duration, run_at) VALUES (?, ?, ?, ?, ?)',
+                [(nodeid, outcome, attempts, duration, run_at) for nodeid, outcome, attempts, duration in results]
+            )
+
+    def scores(self):
+        """
+        计算所有用例的不稳定分数
+        :return: {nodeid: (score, runs)}
+        """
+        rows = self.conn.execute(
+            'SELECT nodeid, outcome, attempts FROM ('
+            'SELECT nodeid, outcome, attempts, '
+            'ROW_NUMBER() OVER (PARTITION BY nodeid ORDER BY id DESC) AS rn FROM test_runs'
+            ') WHERE rn <= ? ORDER BY nodeid, rn DESC',
+            (self.window,)
+        ).fetchall()
+
+        history = defaultdict(list)
+        for nodeid, outcome, attempts in rows:
+            history[nodeid].append((outcome, attempts))
+
+        result = {}
+        for nodeid, runs in history.items():
+            unstable = 0
+            previous = None
+            for outcome, attempts in runs:
+                if (outcome == 'passed' and attempts > 1) or (previous is not None and outcome != previous):
+                    unstable += 1
+                previous = outcome
+            result[nodeid] = (unstable / len(runs), len(runs))
+        return result
+
+    def close(self):
+        self.conn.close()
+
+
+class FlakyPlugin:
+    """
+    失败用例立即重跑，记录执行历史，并将长期不稳定的用例隔离到单独的执行通道
+    重跑时function级fixture(如page)会重新创建，用例使用的api客户端会替换为新的副本
+    """
+
+    def __init__(self, config):
+        self.reruns = config.getoption('flaky_reruns')
+        self.lane = config.getoption('flaky_lane')
+        self.threshold = config.getoption('flaky_threshold')
+        self.min_runs = config.getoption('flaky_min_runs')
+        self.history = FlakyHistory(config.getoption('flaky_db'), config.getoption('flaky_window'))
+        self.results = []
+        self.quarantined = set()
+        self.logger = get_logger()
+
+    def is_quarantined(self, score, runs):
+        return runs >= self.min_runs and score >= self.threshold
+
+    def pytest_collection_modifyitems(self, config, items):
+        self.quarantined = {
+            nodeid for nodeid, (score, runs) in self.history.scores().items()
+            if self.is_quarantined(score, runs)
+        }
+        selected, deselected = [], []
+        for item in items:
+            in_quarantine = item.nodeid in self.quarantined
+            if in_quarantine:
+                item.add_marker(QUARANTINE_MARKER)
+            if self.lane == 'all' or (self.lane == 'quarantine') == in_quarantine:
+                selected.append(item)
+            else:
+                deselected.append(item)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+        for attempt in range(self.reruns + 1):
+            item.stash[FLAKY_ATTEMPT_KEY] = attempt
+            reports, will_rerun = self._run_attempt(item, nextitem, can_rerun=attempt < self.reruns)
+            for report in reports:
+                if will_rerun and report.failed:
+                    report.outcome = 'rerun'
+                item.ihook.pytest_runtest_logreport(report=report)
+            if not will_rerun:
+                break
+            self.logger.warning(f"用例失败，立即重跑 ({attempt + 1}/{self.reruns}): {item.nodeid}")
+        self._collect_result(item, reports, attempt + 1)
+        item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+        return True
+
+    @staticmethod
+    def _run_attempt(item, nextitem, can_rerun):
+        """
+        执行一轮setup/call/teardown，流程与_pytest.runner.runtestprotocol一致
+        需要重跑时只拆除function级fixture，module/session级fixture保留给下一轮使用
+        :return: (报告列表, 是否需要重跑)
+        """
+        hasrequest = hasattr(item, '_request')
+        if hasrequest and not item._request:
+            item._initrequest()
+        try:
+            report = call_and_report(item, 'setup', log=False)
+            reports = [report]
+            if report.passed:
+                setup_only = item.config.getoption('setuponly', False)
+                if item.config.getoption('setupshow', False):
+                    show_test_item(item)
+                if not setup_only:
+                    reports.append(call_and_report(item, 'call', log=False))
+            will_rerun = can_rerun and any(report.failed for report in reports)
+            if item.session.shouldfail or item.session.shouldstop:
+                will_rerun, teardown_until = False, None
+            elif will_rerun:
+                # 拆除到父节点为止，只移除当前用例自身的function级fixture
+                teardown_until = item.parent
+            else:
+                teardown_until = nextitem
+            reports.append(call_and_report(item, 'teardown', log=False, nextitem=teardown_until))
+        finally:
+            if hasrequest:
+                item._request = False
+                item.funcargs = None
+        return reports, will_rerun
+
+    def _collect_result(self, item, reports, attempts):
+        if any(report.failed for report in reports):
+            outcome = 'failed'
+        elif any(report.skipped for report in reports):
+            # 跳过的用例不参与不稳定分数计算
+            return
+        else:
+            outcome = 'passed'
+        duration = sum(report.duration for report in reports)
+        self.results.append((item.nodeid, outcome, attempts, duration))
+
+    def pytest_report_teststatus(self, report):
+        if report.outcome == 'rerun':
+            return 'rerun', 'R', ('RERUN', {'yellow': True})
+
+    def pytest_sessionfinish(self, session):
+        self.history.record(self.results)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        rerun_ids = sorted({report.nodeid for report in terminalreporter.stats.get('rerun', [])})
+        scores = self.history.scores()
+        quarantined = sorted(
+            (nodeid for nodeid, (score, runs) in scores.items() if self.is_quarantined(score, runs)),
+            key=lambda nodeid: -scores[nodeid][0]
+        )
+        if not rerun_ids and not quarantined:
+            return
+
+        terminalreporter.section('不稳定用例统计')
+        if rerun_ids:
+            terminalreporter.write_line(f"本次重跑的用例 ({len(rerun_ids)}):")
+            for nodeid in rerun_ids:
+                score, runs = scores.get(nodeid, (0.0, 0))
+                terminalreporter.write_line(f"  {nodeid}  不稳定分数: {score:.2f} ({runs}次)")
+        if quarantined:
+            terminalreporter.write_line(
+                f"已隔离的用例 ({len(quarantined)}，分数>={self.threshold}，至少{self.min_runs}次执行):")
+            for nodeid in quarantined:
+                score, runs = scores[nodeid]
+                terminalreporter.write_line(f"  {nodeid}  不稳定分数: {score:.2f} ({runs}次)")
+
+    def pytest_unconfigure(self, config):
+        self.history.close()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('flaky', '不稳定用例检测')
+    group.addoption('--flaky', action='store_true', default=False,
+                    help='开启失败用例立即重跑及不稳定用例历史记录')
+    group.addoption('--flaky-reruns', type=int, default=2,
+                    help='失败用例的最大重跑次数，默认2')
+    group.addoption('--flaky-db', default=DEFAULT_DB_PATH,
+                    help='执行历史数据库路径，默认reports/flaky_history.db')
+    group.addoption('--flaky-lane', choices=('all', 'stable', 'quarantine'), default='all',
+                    help='执行通道: all执行全部用例，stable跳过已隔离用例，quarantine只执行已隔离用例')
+    group.addoption('--flaky-threshold', type=float, default=0.3,
+                    help='隔离阈值，不稳定分数达到该值的用例会被隔离，默认0.3')
+    group.addoption('--flaky-min-runs', type=int, default=5,
+                    help='计算隔离前至少需要的执行次数，默认5')
+    group.addoption('--flaky-window', type=int, default=20,
+                    help='计算不稳定分数时使用的最近执行次数，默认20')
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', f'{QUARANTINE_MARKER}: 根据执行历史被隔离的不稳定用例')
+    if config.getoption('flaky'):
+        config.pluginmanager.register(FlakyPlugin(config), 'flaky_plugin')
+
+
+@pytest.fixture(autouse=True)
+def _flaky_fresh_api_session(request):
+    """
+    重跑时为用例提供新的api客户端副本，保留共享客户端的请求头和cookie，但不复用上一轮失败时的连接
+    共享的api客户端本身不受影响，module/session级fixture建立的登录状态和预热连接池对后续用例仍然有效
+    """
+    if request.node.stash.get(FLAKY_ATTEMPT_KEY, 0) == 0 or 'api' not in request.fixturenames:
+        yield
+        return
+    client = request.getfixturevalue('api').clone()
+    # 用例参数从funcargs中读取，替换后只影响当前这一轮执行
+    request.node.funcargs['api'] = client
+    yield client
+    client.session.close()
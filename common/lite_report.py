@@ -0,0 +1,340 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Description: 轻量级报告模式，执行过程中增量写入NDJSON，结束后生成分页懒加载的HTML报告
+
+import os
+import json
+import shutil
+from datetime import datetime
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_LITE_REPORT_DIR = os.path.join(PROJECT_ROOT, 'reports', 'lite_report')
+
+# 每个详情数据文件包含的用例数
+DETAIL_CHUNK_SIZE = 200
+
+# 报告视图: 视图名称 -> 显示名称
+VIEWS = {
+    'run': '执行顺序',
+    'duration': '耗时降序',
+    'failed': '仅失败',
+}
+
+FAILED_OUTCOMES = ('failed', 'error')
+
+
+def _first_line(text):
+    """
+    取描述的第一行非空内容，用于列表展示
+    """
+    if not text:
+        return ''
+    for line in text.strip().splitlines():
+        if line.strip():
+            return line.strip()
+    return ''
+
+
+def _to_js(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+
+
+class LiteReportWriter:
+    """
+    NDJSON结果写入器，每个用例执行结束后追加一行，不在内存中保留结果
+    """
+
+    def __init__(self, report_dir):
+        if not os.path.exists(report_dir):
+            os.makedirs(report_dir)
+        self.results_path = os.path.join(report_dir, 'results.ndjson')
+        self._file = open(self.results_path, 'w', encoding='utf-8')
+        self._phases = {}
+
+    def add_report(self, report):
+        """
+        记录一个阶段的报告，teardown阶段结束后合并写入一行
+        :param report: pytest的TestReport对象
+        """
+        phases = self._phases.setdefault(report.nodeid, [])
+        phases.append(report)
+        if report.when == 'teardown':
+            self._write(self._phases.pop(report.nodeid))
+
+    def _write(self, phases):
+        outcome = 'passed'
+        for report in phases:
+            if report.outcome == 'rerun':
+                outcome = 'rerun'
+            elif report.failed:
+                outcome = 'failed' if report.when == 'call' else 'error'
+            elif report.skipped and outcome == 'passed':
+                outcome = 'xfailed' if hasattr(report, 'wasxfail') else 'skipped'
+            if outcome in FAILED_OUTCOMES + ('rerun',):
+                break
+
+        record = {
+            'nodeid': phases[0].nodeid,
+            'outcome': outcome,
+            'duration': round(sum(report.duration for report in phases), 6),
+            'description': str(getattr(phases[0], 'description', '') or ''),
+            'phases': {report.when: {'outcome': report.outcome, 'duration': round(report.duration, 6)}
+                       for report in phases},
+        }
+        # 只保存失败用例的异常信息和捕获输出，避免报告随用例数量膨胀
+        if outcome != 'passed':
+            record['longrepr'] = '\n\n'.join(
+                report.longreprtext for report in phases if report.longrepr)
+        if outcome in FAILED_OUTCOMES + ('rerun',):
+            record['sections'] = [[name, content] for report in phases for name, content in report.sections]
+
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def close(self):
+        self._file.close()
+
+
+def build_lite_report(report_dir, title, page_size=500):
+    """
+    根据results.ndjson生成分页懒加载的HTML报告
+    列表数据和详情数据拆分为多个js文件，浏览器按需加载，本地直接打开也可以使用
+    :param report_dir: 报告目录，需包含results.ndjson
+    :param title: 报告标题
+    :param page_size: 每页显示的用例数
+    :return: index.html路径
+    """
+    results_path = os.path.join(report_dir, 'results.ndjson')
+    data_dir = os.path.join(report_dir, 'data')
+    if os.path.exists(data_dir):
+        shutil.rmtree(data_dir)
+    os.makedirs(data_dir)
+
+    index = []
+    counts = {}
+    total_duration = 0.0
+    chunk = {}
+
+    def flush_detail():
+        if chunk:
+            chunk_no = min(chunk) // DETAIL_CHUNK_SIZE
+            with open(os.path.join(data_dir, f'detail_{chunk_no:05d}.js'), 'w', encoding='utf-8') as f:
+                f.write(f'liteReport.detail({chunk_no},{_to_js(chunk)});\n')
+            chunk.clear()
+
+    with open(results_path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            idx = len(index)
+            index.append([idx, record['nodeid'], record['outcome'], record['duration'],
+                          _first_line(record.get('description'))])
+            counts[record['outcome']] = counts.get(record['outcome'], 0) + 1
+            total_duration += record['duration']
+            chunk[idx] = record
+            if len(chunk) >= DETAIL_CHUNK_SIZE:
+                flush_detail()
+    flush_detail()
+
+    view_rows = {
+        'run': index,
+        'duration': sorted(index, key=lambda row: row[3], reverse=True),
+        'failed': [row for row in index if row[2] in FAILED_OUTCOMES],
+    }
+    view_pages = {}
+    for view, rows in view_rows.items():
+        view_pages[view] = (len(rows) + page_size - 1) // page_size
+        for page_no in range(view_pages[view]):
+            page_rows = rows[page_no * page_size:(page_no + 1) * page_size]
+            with open(os.path.join(data_dir, f'{view}_{page_no:05d}.js'), 'w', encoding='utf-8') as f:
+                f.write(f'liteReport.page({_to_js(view)},{page_no},{_to_js(page_rows)});\n')
+
+    summary = {
+        'title': title,
+        'generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'total': len(index),
+        'counts': counts,
+        'duration': round(total_duration, 3),
+        'pageSize': page_size,
+        'detailChunkSize': DETAIL_CHUNK_SIZE,
+        'views': VIEWS,
+        'pages': view_pages,
+    }
+    index_path = os.path.join(report_dir, 'index.html')
+    with open(index_path, 'w', encoding='utf-8') as f:
+        f.write(_HTML_TEMPLATE.replace('__TITLE__', title).replace('__SUMMARY__', _to_js(summary)))
+    return index_path
+
+
+class LiteReportPlugin:
+    """
+    轻量级报告插件，替代自包含的pytest-html报告
+    """
+
+    def __init__(self, config):
+        self.report_dir = config.getoption('lite_report_dir')
+        self.page_size = config.getoption('lite_page_size')
+        self.writer = LiteReportWriter(self.report_dir)
+
+    def pytest_runtest_logreport(self, report):
+        self.writer.add_report(report)
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session):
+        self.writer.close()
+        build_lite_report(self.report_dir, 'Himool自动化测试报告', self.page_size)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        terminalreporter.write_sep('-', f"轻量级报告: {os.path.join(self.report_dir, 'index.html')}")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('lite_report', '轻量级报告')
+    group.addoption('--report-mode', choices=('html', 'lite'), default='html',
+                    help='报告模式: html使用pytest-html自包含报告，lite使用增量写入的分页报告')
+    group.addoption('--lite-report-dir', default=DEFAULT_LITE_REPORT_DIR,
+                    help='轻量级报告目录，默认reports/lite_report')
+    group.addoption('--lite-page-size', type=int, default=500,
+                    help='轻量级报告每页显示的用例数，默认500')
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    if config.getoption('report_mode') != 'lite':
+        return
+    # 在pytest-html注册之前关闭自包含报告，pytest.ini中的--html参数无需修改
+    config.option.htmlpath = None
+    # 并行执行时由主进程汇总写入
+    if not hasattr(config, 'workerinput'):
+        config.pluginmanager.register(LiteReportPlugin(config), 'lite_report_plugin')
+
+
+_HTML_TEMPLATE = '''<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+<meta charset="utf-8">
+<title>__TITLE__</title>
+<style>
+body { font-family: -apple-system, "Microsoft YaHei", sans-serif; margin: 20px; color: #333; }
+table { border-collapse: collapse; width: 100%; }
+th, td { border-bottom: 1px solid #eee; padding: 4px 8px; text-align: left; font-size: 13px; }
+tr.row { cursor: pointer; }
+tr.row:hover { background: #f5f7fa; }
+.passed { color: #2e7d32; } .failed, .error { color: #c62828; }
+.skipped, .xfailed { color: #888; } .rerun { color: #ef6c00; }
+.toolbar { margin: 12px 0; }
+.toolbar button, .toolbar select { margin-right: 6px; }
+pre { background: #f6f8fa; padding: 8px; overflow: auto; max-height: 400px; font-size: 12px; }
+td.detail { background: #fafafa; }
+</style>
+</head>
+<body>
+<h2>__TITLE__</h2>
+<div id="summary"></div>
+<div class="toolbar">
+  <select id="view"></select>
+  <button id="prev">上一页</button>
+  <span id="pager"></span>
+  <button id="next">下一页</button>
+</div>
+<table>
+  <thead><tr><th>#</th><th>结果</th><th>用例</th><th>描述</th><th>耗时(s)</th></tr></thead>
+  <tbody id="rows"></tbody>
+</table>
+<script>
+var SUMMARY = __SUMMARY__;
+var pages = {}, details = {}, loading = {};
+var state = {view: 'run', page: 0};
+
+var liteReport = {
+  page: function (view, no, rows) { pages[view + ':' + no] = rows; },
+  detail: function (no, records) { details[no] = records; }
+};
+
+function pad(n) { return ('0000' + n).slice(-5); }
+
+function load(src, key, store, done) {
+  if (store[key]) { done(); return; }
+  if (loading[src]) { loading[src].push(done); return; }
+  loading[src] = [done];
+  var script = document.createElement('script');
+  script.src = src;
+  script.onload = function () { loading[src].forEach(function (cb) { cb(); }); delete loading[src]; };
+  document.head.appendChild(script);
+}
+
+function esc(text) {
+  return String(text).replace(/[&<>"]/g, function (c) {
+    return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'}[c];
+  });
+}
+
+function renderSummary() {
+  var parts = ['共 ' + SUMMARY.total + ' 条', '总耗时 ' + SUMMARY.duration + 's', '生成时间 ' + SUMMARY.generated];
+  Object.keys(SUMMARY.counts).forEach(function (k) {
+    parts.push('<span class="' + k + '">' + k + ': ' + SUMMARY.counts[k] + '</span>');
+  });
+  document.getElementById('summary').innerHTML = parts.join(' | ');
+  var select = document.getElementById('view');
+  Object.keys(SUMMARY.views).forEach(function (k) {
+    var option = document.createElement('option');
+    option.value = k;
+    option.textContent = SUMMARY.views[k];
+    select.appendChild(option);
+  });
+  select.onchange = function () { state.view = select.value; state.page = 0; showPage(); };
+}
+
+function showPage() {
+  var total = SUMMARY.pages[state.view];
+  document.getElementById('pager').textContent = (total ? state.page + 1 : 0) + ' / ' + total;
+  var tbody = document.getElementById('rows');
+  if (!total) { tbody.innerHTML = '<tr><td colspan="5">无数据</td></tr>'; return; }
+  var key = state.view + ':' + state.page;
+  load('data/' + state.view + '_' + pad(state.page) + '.js', key, pages, function () {
+    tbody.innerHTML = pages[key].map(function (r) {
+      return '<tr class="row" data-idx="' + r[0] + '"><td>' + (r[0] + 1) + '</td><td class="' + r[2] + '">' +
+        r[2] + '</td><td>' + esc(r[1]) + '</td><td>' + esc(r[4]) + '</td><td>' + r[3].toFixed(3) + '</td></tr>';
+    }).join('');
+  });
+}
+
+function toggleDetail(tr) {
+  var next = tr.nextSibling;
+  if (next && next.className === 'detail-row') { next.parentNode.removeChild(next); return; }
+  var idx = parseInt(tr.getAttribute('data-idx'), 10);
+  var chunk = Math.floor(idx / SUMMARY.detailChunkSize);
+  load('data/detail_' + pad(chunk) + '.js', chunk, details, function () {
+    var rec = details[chunk][idx];
+    var html = '<p>' + Object.keys(rec.phases).map(function (k) {
+      return k + ': ' + rec.phases[k].outcome + ' (' + rec.phases[k].duration + 's)';
+    }).join(' | ') + '</p>';
+    if (rec.description) html += '<pre>' + esc(rec.description) + '</pre>';
+    if (rec.longrepr) html += '<pre>' + esc(rec.longrepr) + '</pre>';
+    (rec.sections || []).forEach(function (s) { html += '<b>' + esc(s[0]) + '</b><pre>' + esc(s[1]) + '</pre>'; });
+    var row = document.createElement('tr');
+    row.className = 'detail-row';
+    row.innerHTML = '<td class="detail" colspan="5">' + html + '</td>';
+    tr.parentNode.insertBefore(row, tr.nextSibling);
+  });
+}
+
+document.getElementById('rows').onclick = function (e) {
+  var tr = e.target.closest('tr.row');
+  if (tr) toggleDetail(tr);
+};
+document.getElementById('prev').onclick = function () {
+  if (state.page > 0) { state.page--; showPage(); }
+};
+document.getElementById('next').onclick = function () {
+  if (state.page < SUMMARY.pages[state.view] - 1) { state.page++; showPage(); }
+};
+
+renderSummary();
+showPage();
+</script>
+</body>
+</html>
+'''
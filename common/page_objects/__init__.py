@@ -3,5 +3,7 @@
 # @Description: 页面对象模块初始化文件
 
 from common.page_objects.base_page import BasePage
+from common.page_objects.async_base_page import AsyncBasePage
+from common.page_objects.concurrent_users import ConcurrentUsers
 
-__all__ = ['BasePage']
\ No newline at end of file
+__all__ = ['BasePage', 'AsyncBasePage', 'ConcurrentUsers']
\ No newline at end of file
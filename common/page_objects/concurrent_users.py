@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Description: 多用户并发UI场景，在同一个浏览器中打开多个隔离的上下文并发驱动
+
+import asyncio
+from typing import Any, Awaitable, Callable, List
+
+from playwright.async_api import async_playwright
+
+from common.logger import get_logger
+from common.page_objects.async_base_page import AsyncBasePage
+
+
+class ConcurrentUsers:
+    """
+    多用户并发会话
+    每个用户拥有独立的浏览器上下文(cookie、存储互不影响)，共享同一个浏览器进程，
+    在单个事件循环中并发执行场景，用于复现并发操作和资源竞争问题
+    """
+
+    def __init__(self, config, users: int, logger=None, page_class=AsyncBasePage):
+        """
+        初始化多用户会话
+        :param config: 配置对象
+        :param users: 并发用户数
+        :param logger: 日志记录器，如果不提供则创建新的logger
+        :param page_class: 页面对象类，需继承AsyncBasePage
+        """
+        self.config = config
+        self.users = users
+        self.logger = logger or get_logger()
+        self.page_class = page_class
+        self.pages: List[AsyncBasePage] = []
+        self._loop = None
+        self._playwright = None
+        self._browser = None
+        self._contexts = []
+
+    def start(self) -> 'ConcurrentUsers':
+        """
+        启动浏览器并创建所有用户的上下文和页面
+        """
+        self._loop = asyncio.new_event_loop()
+        self._loop.run_until_complete(self._start())
+        return self
+
+    async def _start(self) -> None:
+        browser_type = self.config.get('browser_type', 'chromium').lower()
+        headless = self.config.get('headless', 'True').lower() == 'true'
+        self.logger.info(f"启动浏览器: {browser_type}, headless: {headless}, 并发用户数: {self.users}")
+
+        self._playwright = await async_playwright().start()
+        if browser_type == 'firefox':
+            launcher = self._playwright.firefox
+        elif browser_type == 'webkit':
+            launcher = self._playwright.webkit
+        else:  # 默认使用chromium
+            launcher = self._playwright.chromium
+        self._browser = await launcher.launch(headless=headless)
+
+        self._contexts = await asyncio.gather(*(
+            self._browser.new_context(
+                viewport={'width': 1920, 'height': 1080},
+                user_agent=self.config.get('user_agent', None)
+            ) for _ in range(self.users)
+        ))
+        timeout = int(self.config.get('ui_timeout', 30000))
+        for context in self._contexts:
+            context.set_default_timeout(timeout)
+        pages = await asyncio.gather(*(context.new_page() for context in self._contexts))
+        self.pages = [self.page_class(page, self.logger) for page in pages]
+
+    def run(self, scenario: Callable[..., Awaitable[Any]], *args, **kwargs) -> List[Any]:
+        """
+        为每个用户并发执行同一个场景
+        :param scenario: 异步场景函数，签名为 scenario(page, index, *args, **kwargs)，
+                         page为该用户的页面对象，index为用户序号
+        :return: 各用户场景的返回值列表，按用户序号排列
+        """
+        return self.run_all([scenario] * self.users, *args, **kwargs)
+
+    def run_all(self, scenarios: List[Callable[..., Awaitable[Any]]], *args, **kwargs) -> List[Any]:
+        """
+        每个用户并发执行各自的场景
+        :param scenarios: 异步场景函数列表，长度不能超过用户数，第i个场景由第i个用户执行
+        :return: 各场景的返回值列表
+        """
+        if len(scenarios) > self.users:
+            raise ValueError(f"场景数({len(scenarios)})超过并发用户数({self.users})")
+        self.logger.info(f"并发执行 {len(scenarios)} 个用户场景")
+        return self._loop.run_until_complete(self._gather([
+            scenario(self.pages[index], index, *args, **kwargs)
+            for index, scenario in enumerate(scenarios)
+        ]))
+
+    @staticmethod
+    async def _gather(coroutines) -> List[Any]:
+        """
+        并发执行所有场景，任一场景失败时取消其余场景并等待其结束后再抛出异常，
+        避免失败后其他用户仍在后台操作浏览器
+        """
+        tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    def close(self) -> None:
+        """
+        关闭所有上下文、浏览器及事件循环
+        """
+        if self._loop is None:
+            return
+        self.logger.info("关闭浏览器")
+        self._loop.run_until_complete(self._close())
+        self._loop.close()
+        self._loop = None
+
+    async def _close(self) -> None:
+        for context in self._contexts:
+            await context.close()
+        if self._browser is not None:
+            await self._browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
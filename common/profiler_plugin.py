@@ -0,0 +1,254 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Description: 采样性能分析插件，按用例或整个会话采样调用栈，输出火焰图格式数据
+
+import os
+import re
+import sys
+import glob
+import json
+import time
+import hashlib
+import threading
+from collections import Counter
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PROFILE_DIR = os.path.join(PROJECT_ROOT, 'reports', 'profile')
+
+# 耗时分类
+CATEGORIES = ('framework', 'network', 'browser', 'test', 'other')
+# 调用栈中任意位置出现浏览器或网络等待时优先归入对应分类，
+# Playwright同步API等待时事件循环也会进入selectors，因此浏览器优先于网络；
+# 否则按离栈顶最近的项目代码归入框架代码或用例代码
+WAIT_CATEGORIES = ('browser', 'network')
+CATEGORY_NAMES = {
+    'network': '网络等待',
+    'browser': '浏览器等待',
+    'framework': '框架代码',
+    'test': '用例代码',
+    'other': '其他',
+}
+
+_PATH_SEP = re.escape(os.sep)
+_NETWORK_PATTERN = re.compile(
+    rf'{_PATH_SEP}(?:socket|ssl|selectors)\.py$|{_PATH_SEP}http{_PATH_SEP}client\.py$|'
+    rf'{_PATH_SEP}(?:urllib3|requests){_PATH_SEP}')
+_BROWSER_PATTERN = re.compile(rf'{_PATH_SEP}(?:playwright|greenlet){_PATH_SEP}')
+_FRAMEWORK_PATHS = (os.path.join(PROJECT_ROOT, 'common') + os.sep, os.path.join(PROJECT_ROOT, 'config') + os.sep,
+                    os.path.join(PROJECT_ROOT, 'conftest.py'))
+_TEST_PATH = os.path.join(PROJECT_ROOT, 'test_cases') + os.sep
+
+
+class SamplingProfiler:
+    """
+    采样分析器，在后台线程中定时读取目标线程的调用栈
+    不使用sys.setprofile，被分析代码本身几乎没有额外开销
+    """
+
+    def __init__(self, interval=0.005, thread_id=None):
+        """
+        初始化采样分析器
+        :param interval: 采样间隔(秒)
+        :param thread_id: 目标线程ID，默认为创建分析器的线程
+        """
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks = Counter()
+        self.categories = Counter()
+        self.samples = 0
+        self._last_sample = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._code_cache = {}
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        return self
+
+    def _run(self):
+        current_frames = sys._current_frames
+        self._last_sample = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frame = current_frames().get(self.thread_id)
+            # 目标线程持有GIL时采样会被推迟，按实际间隔计算耗时
+            now = time.perf_counter()
+            elapsed, self._last_sample = now - self._last_sample, now
+            if frame is not None:
+                self._sample(frame, elapsed)
+
+    def _describe(self, code):
+        """
+        生成栈帧描述并判断所属分类，按code对象缓存结果
+        """
+        info = self._code_cache.get(code)
+        if info is None:
+            filename = code.co_filename
+            if _NETWORK_PATTERN.search(filename):
+                category = 'network'
+            elif _BROWSER_PATTERN.search(filename):
+                category = 'browser'
+            elif filename.startswith(_FRAMEWORK_PATHS):
+                category = 'framework'
+            elif filename.startswith(_TEST_PATH):
+                category = 'test'
+            else:
+                category = None
+            if filename.startswith(PROJECT_ROOT):
+                filename = os.path.relpath(filename, PROJECT_ROOT)
+            else:
+                filename = os.path.basename(filename)
+            info = (f'{code.co_name} ({filename}:{code.co_firstlineno})', category)
+            self._code_cache[code] = info
+        return info
+
+    def _sample(self, frame, elapsed):
+        names = []
+        waits = set()
+        nearest = None
+        while frame is not None:
+            name, category = self._describe(frame.f_code)
+            names.append(name)
+            if category in WAIT_CATEGORIES:
+                waits.add(category)
+            elif category and nearest is None:
+                nearest = category
+            frame = frame.f_back
+        names.reverse()
+        self.stacks[';'.join(names)] += 1
+        category = next((c for c in WAIT_CATEGORIES if c in waits), nearest or 'other')
+        self.categories[category] += elapsed
+        self.samples += 1
+
+    def breakdown(self):
+        """
+        各分类耗时估算
+        :return: {分类: 耗时秒}
+        """
+        return {category: self.categories[category] for category in CATEGORIES}
+
+    def write_folded(self, path):
+        """
+        输出折叠栈格式，可直接用于flamegraph.pl、speedscope等工具
+        :param path: 输出文件路径
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f'{stack} {count}\n')
+
+
+def _safe_name(nodeid):
+    # 截断后的名称可能重复(如参数化用例)，附加完整nodeid的短哈希
+    digest = hashlib.sha1(nodeid.encode('utf-8')).hexdigest()[:8]
+    name = re.sub(r'[^\w.\-]+', '_', nodeid).strip('_')[:150]
+    return f'{name}_{digest}'
+
+
+class ProfilerPlugin:
+    """
+    性能分析插件，test模式下每个用例单独采样，session模式下整个会话共用一个采样器
+    并行执行时各worker写入summary_<workerid>.json，由主进程合并为summary.json
+    """
+
+    def __init__(self, config):
+        self.mode = config.getoption('profile')
+        self.interval = config.getoption('profile_interval') / 1000
+        self.profile_dir = config.getoption('profile_dir')
+        if not os.path.exists(self.profile_dir):
+            os.makedirs(self.profile_dir)
+        workerinput = getattr(config, 'workerinput', None)
+        self.worker_id = workerinput['workerid'] if workerinput else None
+        # 主进程不执行用例，只负责合并worker的结果
+        self.is_controller = self.worker_id is None and getattr(config.option, 'dist', 'no') != 'no'
+        # 清理上次执行的结果，避免与本次的summary.json混在一起；worker启动时其他worker可能已开始写入，不做清理
+        if self.worker_id is None:
+            for path in self._worker_summaries() + glob.glob(os.path.join(self.profile_dir, '*.folded')):
+                os.remove(path)
+        self.session_profiler = None
+        self.summary = {}
+
+    def _worker_summaries(self):
+        return glob.glob(os.path.join(self.profile_dir, 'summary_*.json'))
+
+    def _record(self, name, profiler):
+        path = os.path.join(self.profile_dir, f'{_safe_name(name)}.folded')
+        profiler.write_folded(path)
+        self.summary[name] = {
+            'samples': profiler.samples,
+            'folded': os.path.relpath(path, self.profile_dir),
+            'breakdown': {category: round(seconds, 3) for category, seconds in profiler.breakdown().items()},
+        }
+
+    def pytest_sessionstart(self, session):
+        if self.mode == 'session' and not self.is_controller:
+            self.session_profiler = SamplingProfiler(self.interval).start()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        if self.mode != 'test':
+            yield
+            return
+        profiler = SamplingProfiler(self.interval).start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            self._record(item.nodeid, profiler)
+
+    def pytest_sessionfinish(self, session):
+        if self.session_profiler is not None:
+            name = f'session_{self.worker_id}' if self.worker_id else 'session'
+            self._record(name, self.session_profiler.stop())
+        if self.is_controller:
+            for path in sorted(self._worker_summaries()):
+                with open(path, encoding='utf-8') as f:
+                    self.summary.update(json.load(f))
+        summary_name = f'summary_{self.worker_id}.json' if self.worker_id else 'summary.json'
+        with open(os.path.join(self.profile_dir, summary_name), 'w', encoding='utf-8') as f:
+            json.dump(self.summary, f, ensure_ascii=False, indent=2)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.summary:
+            return
+        totals = Counter()
+        for entry in self.summary.values():
+            totals.update(entry['breakdown'])
+        total = sum(totals.values()) or 1
+
+        terminalreporter.section('性能分析')
+        for category in CATEGORIES:
+            seconds = totals[category]
+            terminalreporter.write_line(
+                f"  {CATEGORY_NAMES[category]:<8} {seconds:>8.3f}s  {seconds / total * 100:5.1f}%")
+        if self.mode == 'test':
+            slowest = sorted(self.summary.items(), key=lambda kv: -sum(kv[1]['breakdown'].values()))[:5]
+            terminalreporter.write_line('  最慢的用例:')
+            for nodeid, entry in slowest:
+                terminalreporter.write_line(f"    {sum(entry['breakdown'].values()):.3f}s  {nodeid}")
+        terminalreporter.write_line(f"  火焰图数据目录: {self.profile_dir}")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('profile', '性能分析')
+    group.addoption('--profile', choices=('off', 'test', 'session'), default='off',
+                    help='采样性能分析: test按用例分析，session分析整个会话，默认off')
+    group.addoption('--profile-interval', type=float, default=5,
+                    help='采样间隔(毫秒)，默认5')
+    group.addoption('--profile-dir', default=DEFAULT_PROFILE_DIR,
+                    help='分析结果输出目录，默认reports/profile')
+
+
+def pytest_configure(config):
+    # 关闭时不注册插件，不产生任何额外开销
+    if config.getoption('profile') != 'off':
+        config.pluginmanager.register(ProfilerPlugin(config), 'profiler_plugin')
@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Description: 流式上传/下载辅助工具，避免大文件整体读入内存
+
+import os
+import time
+import uuid
+import hashlib
+
+# 默认分块大小: 1MB
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+def format_size(num_bytes):
+    """
+    将字节数格式化为易读的字符串
+    :param num_bytes: 字节数，None表示未知
+    :return: 格式化后的字符串，如 '12.50 MB'
+    """
+    if num_bytes is None:
+        return '未知大小'
+    size = float(num_bytes)
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.2f} {unit}" if unit != 'B' else f"{int(size)} B"
+        size /= 1024
+
+
+class TransferStats:
+    """
+    传输统计信息，记录传输字节数、耗时、吞吐量及摘要值
+    """
+
+    def __init__(self, total=None, hash_algo=None, progress_callback=None):
+        """
+        初始化传输统计
+        :param total: 预期总字节数，未知时为None
+        :param hash_algo: 摘要算法名称，如'sha256'，为None时不计算
+        :param progress_callback: 进度回调，签名为 callback(transferred, total)
+        """
+        self.total = total
+        self.transferred = 0
+        self.status_code = None
+        self.path = None
+        self.started_at = time.perf_counter()
+        self.finished_at = None
+        self._hasher = hashlib.new(hash_algo) if hash_algo else None
+        self._progress_callback = progress_callback
+
+    def update(self, chunk):
+        """
+        累计一个数据块
+        :param chunk: 已传输的数据块
+        """
+        self.transferred += len(chunk)
+        if self._hasher is not None:
+            self._hasher.update(chunk)
+        if self._progress_callback:
+            self._progress_callback(self.transferred, self.total)
+
+    def finish(self):
+        """
+        标记传输结束
+        """
+        self.finished_at = time.perf_counter()
+        return self
+
+    @property
+    def elapsed(self):
+        """
+        传输耗时(秒)
+        """
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return end - self.started_at
+
+    @property
+    def throughput(self):
+        """
+        吞吐量(字节/秒)
+        """
+        elapsed = self.elapsed
+        return self.transferred / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def digest(self):
+        """
+        已传输内容的十六进制摘要，未开启摘要时为None
+        """
+        return self._hasher.hexdigest() if self._hasher is not None else None
+
+    def summary(self):
+        """
+        生成用于日志输出的摘要信息
+        """
+        return (f"{format_size(self.transferred)}，耗时 {self.elapsed:.2f}s，"
+                f"吞吐量 {format_size(self.throughput)}/s")
+
+
+def _source_length(source):
+    """
+    计算数据源长度，无法预知长度(如生成器)时返回None
+    """
+    if isinstance(source, (bytes, bytearray)):
+        return len(source)
+    if hasattr(source, 'seek') and hasattr(source, 'tell'):
+        try:
+            current = source.tell()
+            source.seek(0, os.SEEK_END)
+            end = source.tell()
+            source.seek(current)
+            return end - current
+        except (OSError, ValueError):
+            return None
+    return None
+
+
+def _iter_source(source, chunk_size):
+    """
+    将数据源按块迭代输出
+    :param source: bytes、二进制文件对象或产生bytes的可迭代对象
+    :param chunk_size: 分块大小
+    """
+    if isinstance(source, (bytes, bytearray)):
+        for start in range(0, len(source), chunk_size):
+            yield bytes(source[start:start + chunk_size])
+    elif hasattr(source, 'read'):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    else:
+        for chunk in source:
+            if chunk:
+                yield chunk
+
+
+class MultipartStream:
+    """
+    流式multipart/form-data请求体
+    按块从文件对象或生成器读取内容，不在内存中拼接完整请求体。
+    所有数据源长度可知时提供Content-Length，否则requests会使用分块传输编码
+    """
+
+    def __init__(self, fields=None, files=None, chunk_size=DEFAULT_CHUNK_SIZE, stats=None):
+        """
+        初始化multipart请求体
+        :param fields: 普通表单字段，dict形式 {name: value}
+        :param files: 文件字段，dict形式 {name: (filename, source[, content_type])}，
+                      source可以是bytes、二进制文件对象或产生bytes的生成器
+        :param chunk_size: 读取数据源时的分块大小
+        :param stats: TransferStats对象，用于记录上传进度
+        """
+        self.boundary = uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        self.stats = stats
+        self._parts = []
+
+        for name, value in (fields or {}).items():
+            header = (f'--{self.boundary}\r\n'
+                      f'Content-Disposition: form-data; name="{name}"\r\n\r\n').encode('utf-8')
+            self._parts.append((header, str(value).encode('utf-8')))
+
+        for name, file_info in (files or {}).items():
+            filename, source = file_info[0], file_info[1]
+            content_type = file_info[2] if len(file_info) > 2 else 'application/octet-stream'
+            header = (f'--{self.boundary}\r\n'
+                      f'Content-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                      f'Content-Type: {content_type}\r\n\r\n').encode('utf-8')
+            self._parts.append((header, source))
+
+        self._trailer = f'--{self.boundary}--\r\n'.encode('utf-8')
+        self.length = self._compute_length()
+        if self.stats is not None:
+            self.stats.total = self.length
+
+    @property
+    def content_type(self):
+        """
+        请求头Content-Type的值
+        """
+        return f'multipart/form-data; boundary={self.boundary}'
+
+    def _compute_length(self):
+        """
+        计算请求体总长度，任一数据源长度未知时返回None
+        """
+        total = len(self._trailer)
+        for header, source in self._parts:
+            source_length = _source_length(source)
+            if source_length is None:
+                return None
+            total += len(header) + source_length + 2
+        return total
+
+    def __len__(self):
+        # requests通过super_len判断是否设置Content-Length，长度未知时返回0以启用分块传输
+        return self.length or 0
+
+    def __bool__(self):
+        # 避免长度为0时被requests的 `data or {}` 当作空请求体
+        return True
+
+    def __iter__(self):
+        for header, source in self._parts:
+            yield self._track(header)
+            for chunk in _iter_source(source, self.chunk_size):
+                yield self._track(chunk)
+            yield self._track(b'\r\n')
+        yield self._track(self._trailer)
+
+    def _track(self, chunk):
+        if self.stats is not None:
+            self.stats.update(chunk)
+        return chunk
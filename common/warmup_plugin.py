@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Description: 会话启动前的环境预热与健康检查，环境不可用时快速终止测试会话
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+from requests.exceptions import RequestException
+
+from common.api_client import ApiClient
+from common.logger import get_logger
+from config.settings import load_config, build_api_config
+
+# 预热阶段创建的API客户端，api fixture会复用其中已建立的连接池
+WARM_API_CLIENT_KEY = pytest.StashKey[ApiClient]()
+
+# 网关可达但后端不可用的状态码
+UNHEALTHY_STATUS_CODES = (502, 503, 504)
+
+
+class CheckResult:
+    """
+    单项检查结果
+    """
+
+    def __init__(self, name, target, ok, elapsed, detail):
+        self.name = name
+        self.target = target
+        self.ok = ok
+        self.elapsed = elapsed
+        self.detail = detail
+
+    def __str__(self):
+        status = '正常' if self.ok else '异常'
+        return f"[{status}] {self.name} {self.target} ({self.elapsed * 1000:.0f}ms) {self.detail}"
+
+
+def check_url(session, name, url, timeout):
+    """
+    检查URL是否可达，只要收到非网关错误的HTTP响应即视为可达
+    :param session: requests会话，复用会话可同时建立连接池中的连接
+    :param name: 检查项名称
+    :param url: 目标URL
+    :param timeout: 超时时间(秒)
+    :return: CheckResult对象
+    """
+    start = time.perf_counter()
+    try:
+        # 读取完整响应体，连接才会以可复用状态归还连接池；未读取就close会直接关闭socket
+        response = session.get(url, timeout=timeout)
+    except RequestException as e:
+        return CheckResult(name, url, False, time.perf_counter() - start, f"请求失败: {e}")
+    ok = response.status_code not in UNHEALTHY_STATUS_CODES
+    return CheckResult(name, url, ok, time.perf_counter() - start, f"HTTP {response.status_code}")
+
+
+def pooled_connections(session, url):
+    """
+    统计连接池中已建立且空闲可复用的连接数
+    :param session: requests会话
+    :param url: 目标URL
+    :return: 空闲连接数
+    """
+    pool = session.get_adapter(url).poolmanager.connection_from_url(url)
+    # 连接池队列预先填充None占位，只统计已建立socket的连接
+    return sum(1 for conn in list(pool.pool.queue) if conn is not None and getattr(conn, 'sock', None) is not None)
+
+
+def prime_browser(config, url, timeout):
+    """
+    启动浏览器并打开一次UI首页，预热前端资源和后端缓存
+    :param config: 配置字典
+    :param url: UI首页地址
+    :param timeout: 超时时间(秒)
+    :return: CheckResult对象
+    """
+    from playwright.sync_api import sync_playwright
+
+    start = time.perf_counter()
+    browser_type = config.get('browser_type', 'chromium').lower()
+    try:
+        with sync_playwright() as playwright:
+            launcher = getattr(playwright, browser_type, playwright.chromium)
+            browser = launcher.launch(headless=True)
+            try:
+                context = browser.new_context(user_agent=config.get('user_agent', None))
+                page = context.new_page()
+                response = page.goto(url, wait_until='load', timeout=timeout * 1000)
+                status = response.status if response else 0
+            finally:
+                browser.close()
+    except Exception as e:
+        return CheckResult('浏览器预热', url, False, time.perf_counter() - start, f"加载失败: {e}")
+    ok = status not in UNHEALTHY_STATUS_CODES
+    return CheckResult('浏览器预热', url, ok, time.perf_counter() - start, f"HTTP {status}")
+
+
+def run_warmup(config, timeout, connections, browser=False, logger=None):
+    """
+    并发检查API和UI地址，预先建立API连接池，可选预热浏览器
+    :param config: 配置字典
+    :param timeout: 单项检查超时时间(秒)
+    :param connections: 预先建立的API连接数
+    :param browser: 是否预热浏览器
+    :param logger: 日志记录器
+    :return: (检查结果列表, 预热后的ApiClient)
+    """
+    logger = logger or get_logger()
+    api_client = ApiClient(build_api_config(config), logger)
+    ui_session = requests.Session()
+
+    api_url = config.get('api_base_url') or config.get('base_url')
+    ui_url = config.get('ui_base_url')
+
+    with ThreadPoolExecutor(max_workers=max(connections, 1) + 1) as executor:
+        futures = [executor.submit(check_url, api_client.session, 'API', api_url, timeout)
+                   for _ in range(max(connections, 1))]
+        if ui_url:
+            futures.append(executor.submit(check_url, ui_session, 'UI', ui_url, timeout))
+        results = [future.result() for future in futures]
+    ui_session.close()
+
+    # 多个并发连接的检查结果合并为一条，取最慢的一次
+    api_results = [result for result in results if result.name == 'API']
+    failed = [result for result in api_results if not result.ok]
+    api_result = failed[0] if failed else max(api_results, key=lambda result: result.elapsed)
+    if api_url and not failed:
+        pooled = pooled_connections(api_client.session, api_url)
+        api_result.detail += f"，连接池中可复用连接 {pooled}/{len(api_results)} 个"
+        if pooled < len(api_results):
+            logger.warning(f"预热连接未能全部保留在连接池中，服务端可能未开启keep-alive: {pooled}/{len(api_results)}")
+    results = [api_result] + [result for result in results if result.name != 'API']
+
+    if browser and ui_url and all(result.ok for result in results):
+        results.append(prime_browser(config, ui_url, timeout))
+
+    return results, api_client
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('warmup', '环境预热与健康检查')
+    group.addoption('--warmup', action='store_true', default=False,
+                    help='会话开始前检查环境可用性并预热连接，环境异常时终止会话')
+    group.addoption('--warmup-timeout', type=float, default=5,
+                    help='单项检查超时时间(秒)，默认5')
+    group.addoption('--warmup-connections', type=int, default=4,
+                    help='预先建立的API连接数，并行执行时为每个worker的连接数，默认4')
+    group.addoption('--warmup-browser', action='store_true', default=False,
+                    help='预热时打开一次UI首页')
+
+
+def pytest_sessionstart(session):
+    config = session.config
+    if not config.getoption('warmup'):
+        return
+
+    logger = get_logger()
+    env_config = load_config()
+    # 并行执行时主进程只做健康检查，环境异常时终止会话；用例在worker中执行，连接池由各worker自行预热
+    if hasattr(config, 'workerinput'):
+        results, api_client = run_warmup(
+            env_config,
+            timeout=config.getoption('warmup_timeout'),
+            connections=config.getoption('warmup_connections'),
+            logger=logger
+        )
+        for result in results:
+            logger.info(f"环境预热[{config.workerinput['workerid']}]: {result}")
+        if all(result.ok for result in results):
+            config.stash[WARM_API_CLIENT_KEY] = api_client
+        else:
+            api_client.session.close()
+        return
+
+    is_controller = getattr(config.option, 'dist', 'no') != 'no'
+    start = time.perf_counter()
+    results, api_client = run_warmup(
+        env_config,
+        timeout=config.getoption('warmup_timeout'),
+        connections=1 if is_controller else config.getoption('warmup_connections'),
+        browser=config.getoption('warmup_browser'),
+        logger=logger
+    )
+    elapsed = time.perf_counter() - start
+
+    lines = [str(result) for result in results]
+    for line in lines:
+        logger.info(f"环境预热: {line}")
+
+    reporter = config.pluginmanager.get_plugin('terminalreporter')
+    if reporter is not None:
+        reporter.write_line(f"环境预热完成，耗时 {elapsed:.2f}s")
+        for line in lines:
+            reporter.write_line(f"  {line}")
+
+    healthy = all(result.ok for result in results)
+    if is_controller or not healthy:
+        api_client.session.close()
+    if not healthy:
+        pytest.exit('环境健康检查失败，终止测试会话:\n' + '\n'.join(lines),
+                    returncode=pytest.ExitCode.INTERRUPTED)
+
+    if not is_controller:
+        config.stash[WARM_API_CLIENT_KEY] = api_client
+
+
+def pytest_sessionfinish(session):
+    api_client = session.config.stash.get(WARM_API_CLIENT_KEY, None)
+    if api_client is not None:
+        api_client.session.close()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Description: 配置加载，合并config.ini中DEFAULT和TEST_ENV指定环境的配置
+
+import os
+import configparser
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.ini')
+
+# 生产环境名称，数据库重置等破坏性操作默认不允许在该环境执行
+PROD_ENV = 'PROD'
+
+
+def current_env():
+    """
+    获取当前环境名称
+    :return: 环境变量TEST_ENV的值，未设置时为TEST
+    """
+    return os.environ.get('TEST_ENV', 'TEST')
+
+
+def load_config(env=None, config_path=CONFIG_PATH):
+    """
+    读取配置文件，合并DEFAULT和指定环境的配置
+    :param env: 环境名称，默认读取环境变量TEST_ENV，未设置时使用TEST
+    :param config_path: 配置文件路径
+    :return: 配置字典
+    """
+    config_parser = configparser.ConfigParser()
+    config_parser.read(config_path, encoding='utf-8')
+
+    # 默认使用TEST环境配置
+    env = env or current_env()
+
+    merged_config = dict(config_parser['DEFAULT'])
+    if env in config_parser:
+        merged_config.update(dict(config_parser[env]))
+
+    return merged_config
+
+
+def build_api_config(config):
+    """
+    生成API客户端使用的配置，如果配置中有api_base_url，则使用它替换base_url
+    :param config: 配置字典
+    :return: API配置字典
+    """
+    if 'api_base_url' in config:
+        api_config = config.copy()
+        api_config['base_url'] = config['api_base_url']
+        return api_config
+    return config
@@ -4,13 +4,18 @@
 
 import os
 import pytest
-import configparser
 from datetime import datetime
 import pytest_html
 from playwright.sync_api import sync_playwright
 
 from common.api_client import ApiClient
 from common.logger import get_logger
+from common.page_objects import ConcurrentUsers
+from config.settings import load_config, build_api_config
+
+# 注册框架插件
+pytest_plugins = ['common.flaky_plugin', 'common.warmup_plugin', 'common.lite_report',
+                  'common.profiler_plugin', 'common.db_plugin']
 
 # 配置报告目录
 REPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'reports')
@@ -51,12 +56,15 @@ def pytest_html_results_table_row(report, cells):
 def pytest_runtest_makereport(item, call):
     outcome = yield
     report = outcome.get_result()
-    report.description = str(item.function.__doc__)
+    report.description = item.function.__doc__ or ''
 
 # 测试会话结束后的处理
 def pytest_sessionfinish(session, exitstatus):
     print(f"\n测试执行完成，退出状态: {exitstatus}")
-    print(f"HTML报告路径: {HTML_REPORT_DIR}")
+    if session.config.getoption('report_mode') == 'lite':
+        print(f"轻量级报告路径: {session.config.getoption('lite_report_dir')}")
+    else:
+        print(f"HTML报告路径: {HTML_REPORT_DIR}")
     print(f"Allure报告路径: {ALLURE_REPORT_DIR}")
 
 
@@ -67,19 +75,7 @@ def config():
     读取配置文件，返回配置对象
     :return: 配置对象
     """
-    config_parser = configparser.ConfigParser()
-    config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config', 'config.ini')
-    config_parser.read(config_path, encoding='utf-8')
-    
-    # 默认使用TEST环境配置
-    env = os.environ.get('TEST_ENV', 'TEST')
-    
-    # 合并DEFAULT和指定环境的配置
-    merged_config = dict(config_parser['DEFAULT'])
-    if env in config_parser:
-        merged_config.update(dict(config_parser[env]))
-    
-    return merged_config
+    return load_config()
 
 
 # 日志fixture
@@ -94,21 +90,20 @@ def logger():
 
 # API客户端fixture
 @pytest.fixture(scope="session")
-def api(config, logger):
+def api(request, config, logger):
     """
-    创建API客户端实例
+    创建API客户端实例，开启--warmup时复用预热阶段已建立连接池的客户端
+    :param request: pytest请求对象
     :param config: 配置对象
     :param logger: 日志记录器
     :return: ApiClient实例
     """
-    # 如果配置中有api_base_url，则使用它替换base_url
-    if 'api_base_url' in config:
-        api_config = config.copy()
-        api_config['base_url'] = config['api_base_url']
-    else:
-        api_config = config
-        
-    api_client = ApiClient(api_config, logger)
+    # 插件由pytest_plugins注册后再导入，避免提前导入导致断言重写失效
+    from common.warmup_plugin import WARM_API_CLIENT_KEY
+    
+    api_client = request.config.stash.get(WARM_API_CLIENT_KEY, None)
+    if api_client is None:
+        api_client = ApiClient(build_api_config(config), logger)
     yield api_client
 
 
@@ -154,4 +149,26 @@ def page(config, logger):
     logger.info("关闭浏览器")
     context.close()
     browser.close()
-    playwright.stop()
\ No newline at end of file
+    playwright.stop()
+
+
+# 多用户并发页面fixture
+@pytest.fixture(scope="function")
+def concurrent_users(request, config, logger):
+    """
+    在同一个浏览器中创建多个隔离的上下文，供单个用例并发驱动
+    用户数通过 @pytest.mark.users(n) 指定，默认读取配置项concurrent_users
+    :param request: pytest请求对象
+    :param config: 配置对象
+    :param logger: 日志记录器
+    :return: ConcurrentUsers实例
+    """
+    marker = request.node.get_closest_marker('users')
+    users = int(marker.args[0]) if marker else int(config.get('concurrent_users', 3))
+    
+    session = ConcurrentUsers(config, users, logger)
+    try:
+        session.start()
+        yield session
+    finally:
+        session.close()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Description: API客户端流式上传/下载测试
+
+import io
+import json
+import hashlib
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+import requests
+
+from common.api_client import ApiClient, LOG_TEXT_PREVIEW_CHARS
+
+DOWNLOAD_SIZE = 3 * 1024 * 1024 + 123
+
+
+def _payload(size):
+    """
+    生成指定大小的确定性内容
+    """
+    block = bytes(range(256)) * 4096
+    return (block * (size // len(block) + 1))[:size]
+
+
+class _TransferHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        if parsed.path == '/download':
+            body = _payload(int(query['size'][0]))
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/octet-stream')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif parsed.path == '/truncated':
+            # 声明的长度大于实际发送的内容，模拟传输中断
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/octet-stream')
+            self.send_header('Content-Length', str(DOWNLOAD_SIZE))
+            self.end_headers()
+            self.wfile.write(_payload(1024))
+            self.close_connection = True
+        elif parsed.path == '/text':
+            self._send(200, query['body'][0].encode('utf-8'), 'text/plain; charset=utf-8')
+        else:
+            self._send(int(parsed.path.strip('/')), b'error page', 'text/html')
+
+    def do_POST(self):
+        if self.headers.get('Transfer-Encoding') == 'chunked':
+            body = self._read_chunked()
+        else:
+            body = self.rfile.read(int(self.headers['Content-Length']))
+        result = {
+            'chunked': self.headers.get('Transfer-Encoding') == 'chunked',
+            'content_length': self.headers.get('Content-Length'),
+            'received': len(body),
+            'sha256': hashlib.sha256(body).hexdigest(),
+        }
+        self._send(200, json.dumps(result).encode('utf-8'), 'application/json')
+
+    def _read_chunked(self):
+        body = bytearray()
+        while True:
+            size = int(self.rfile.readline().split(b';')[0], 16)
+            if size == 0:
+                self.rfile.readline()
+                return bytes(body)
+            body += self.rfile.read(size)
+            self.rfile.readline()
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api_client():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _TransferHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    client = ApiClient({'base_url': f'http://127.0.0.1:{server.server_address[1]}', 'retry_times': 1})
+    yield client
+    client.session.close()
+    server.shutdown()
+    server.server_close()
+
+
+def test_download_to_file_with_digest_and_progress(api_client, tmp_path):
+    """
+    下载内容按块写入文件，摘要和进度回调与实际内容一致
+    """
+    progress = []
+    dest = tmp_path / 'export.bin'
+
+    stats = api_client.download('/download', dest=dest, params={'size': DOWNLOAD_SIZE}, chunk_size=1024 * 1024,
+                                hash_algo='sha256', progress_callback=lambda done, total: progress.append((done, total)))
+
+    expected = _payload(DOWNLOAD_SIZE)
+    assert dest.read_bytes() == expected
+    assert stats.path == str(dest)
+    assert stats.status_code == 200
+    assert stats.transferred == stats.total == DOWNLOAD_SIZE
+    assert stats.digest == hashlib.sha256(expected).hexdigest()
+    assert len(progress) > 1
+    assert progress[-1] == (DOWNLOAD_SIZE, DOWNLOAD_SIZE)
+    assert all(total == DOWNLOAD_SIZE for _, total in progress)
+
+
+def test_download_without_dest_only_computes_digest(api_client):
+    """
+    不指定目标文件时只计算摘要，不保存内容
+    """
+    stats = api_client.download('/download', params={'size': DOWNLOAD_SIZE}, hash_algo='md5')
+
+    assert stats.path is None
+    assert stats.digest == hashlib.md5(_payload(DOWNLOAD_SIZE)).hexdigest()
+
+
+@pytest.mark.parametrize('status', [404, 500])
+def test_download_error_status_raises(api_client, tmp_path, status):
+    """
+    错误响应抛出HTTPError，且不写入目标文件
+    """
+    dest = tmp_path / 'export.bin'
+
+    with pytest.raises(requests.HTTPError):
+        api_client.download(f'/{status}', dest=dest)
+    assert not dest.exists()
+
+
+def test_interrupted_download_removes_partial_file(api_client, tmp_path):
+    """
+    传输中断时删除已写入的不完整文件
+    """
+    dest = tmp_path / 'export.bin'
+
+    with pytest.raises(requests.RequestException):
+        api_client.download('/truncated', dest=dest)
+    assert not dest.exists()
+
+
+def test_upload_generator_uses_chunked_encoding(api_client):
+    """
+    生成器数据源长度未知，使用分块传输编码上传
+    """
+    chunks = [_payload(256 * 1024) for _ in range(4)]
+    progress = []
+
+    response = api_client.upload('/upload', files={'file': ('data.bin', iter(chunks))}, fields={'sku': 'A1'},
+                                 progress_callback=lambda done, total: progress.append((done, total)))
+
+    result = response.json()
+    assert result['chunked'] is True
+    assert result['content_length'] is None
+    assert result['received'] == response.transfer_stats.transferred
+    assert progress[-1] == (response.transfer_stats.transferred, None)
+
+
+def test_upload_file_object_sends_content_length(api_client):
+    """
+    文件对象长度可知，上传时携带Content-Length，内容与源文件一致
+    """
+    source = _payload(DOWNLOAD_SIZE)
+
+    response = api_client.upload('/upload', files={'file': ('data.bin', io.BytesIO(source))})
+
+    result = response.json()
+    stats = response.transfer_stats
+    assert result['chunked'] is False
+    assert int(result['content_length']) == result['received'] == stats.total == stats.transferred
+    assert result['received'] > len(source)
+
+
+def test_text_response_preview_counts_characters(api_client):
+    """
+    响应体截断按字符数判断，多字节字符不会被误判为截断
+    """
+    logger = logging.getLogger('test_api_client')
+    logger.setLevel(logging.DEBUG)
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger.addHandler(handler)
+    api_client.logger = logger
+    try:
+        api_client.get('/text', params={'body': '中' * LOG_TEXT_PREVIEW_CHARS})
+        api_client.get('/text', params={'body': '中' * (LOG_TEXT_PREVIEW_CHARS + 1)})
+    finally:
+        logger.removeHandler(handler)
+
+    bodies = [record.getMessage() for record in records if record.getMessage().startswith('响应体')]
+    assert bodies[0] == '响应体: ' + '中' * LOG_TEXT_PREVIEW_CHARS
+    assert bodies[1].startswith('响应体(截断): ')
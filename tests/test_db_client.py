@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Description: 数据库客户端测试，使用本地SQLite文件
+
+import pytest
+
+from common.db_client import DbClient
+
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    client = DbClient(f"sqlite:///{tmp_path / 'test.db'}")
+    client.execute("CREATE TABLE stock (id INTEGER PRIMARY KEY AUTOINCREMENT, sku TEXT, qty INTEGER)")
+    yield client
+    client.close()
+
+
+def _rows(sqlite_db):
+    return sqlite_db.query("SELECT id, sku, qty FROM stock ORDER BY id")
+
+
+def _sequence(sqlite_db):
+    return sqlite_db.query("SELECT seq FROM sqlite_sequence WHERE name = 'stock'")[0][0]
+
+
+def test_bulk_insert_in_batches(sqlite_db):
+    """
+    批量插入跨多个批次，结果完整
+    """
+    rows = [{'sku': f'SKU{i}', 'qty': i} for i in range(2500)]
+
+    assert sqlite_db.bulk_insert('stock', rows, batch_size=1000) == 2500
+    assert sqlite_db.query("SELECT COUNT(*), SUM(qty) FROM stock")[0] == (2500, sum(range(2500)))
+
+
+def test_bulk_insert_is_atomic(sqlite_db):
+    """
+    最后一批插入失败时，之前的批次一起回滚
+    """
+    rows = [{'id': i, 'sku': f'SKU{i}', 'qty': i} for i in range(1, 2501)]
+    rows.append({'id': 1, 'sku': 'DUP', 'qty': 0})
+
+    with pytest.raises(Exception):
+        sqlite_db.bulk_insert('stock', rows, batch_size=1000)
+    assert _rows(sqlite_db) == []
+
+
+def test_snapshot_restore_round_trip(sqlite_db):
+    """
+    快照后修改、删除、新增数据，恢复后数据和自增序列都回到快照时的状态
+    """
+    sqlite_db.bulk_insert('stock', [{'sku': f'SKU{i}', 'qty': i} for i in range(2500)])
+    sqlite_db.snapshot(['stock'])
+    expected_rows, expected_seq = _rows(sqlite_db), _sequence(sqlite_db)
+
+    sqlite_db.execute("UPDATE stock SET qty = 0 WHERE id <= 10")
+    sqlite_db.execute("DELETE FROM stock WHERE id > 2000")
+    sqlite_db.bulk_insert('stock', [{'sku': 'NEW', 'qty': 1}])
+    sqlite_db.restore()
+
+    assert _rows(sqlite_db) == expected_rows
+    assert _sequence(sqlite_db) == expected_seq == 2500
+    sqlite_db.bulk_insert('stock', [{'sku': 'NEXT', 'qty': 1}])
+    assert sqlite_db.query("SELECT MAX(id) FROM stock")[0][0] == 2501
+
+    sqlite_db.drop_snapshot()
+    assert sqlite_db.tables() == ['stock']
+
+
+def test_restore_resets_sequence_after_trailing_deletes(sqlite_db):
+    """
+    快照时末尾ID已被删除，恢复后序列值仍与快照时一致
+    """
+    sqlite_db.bulk_insert('stock', [{'sku': f'SKU{i}', 'qty': i} for i in range(2501)])
+    sqlite_db.execute("DELETE FROM stock WHERE id = 2501")
+    sqlite_db.snapshot(['stock'])
+
+    sqlite_db.restore()
+
+    assert sqlite_db.query("SELECT MAX(id) FROM stock")[0][0] == 2500
+    assert _sequence(sqlite_db) == 2501
+
+
+def test_nested_transaction_rollback_uses_savepoint(sqlite_db):
+    """
+    内层rollback=True只撤销内层修改，外层提交不受影响
+    """
+    with sqlite_db.transaction():
+        sqlite_db.bulk_insert('stock', [{'sku': 'OUTER', 'qty': 1}])
+        with sqlite_db.transaction(rollback=True):
+            sqlite_db.bulk_insert('stock', [{'sku': 'INNER', 'qty': 2}])
+            assert len(_rows(sqlite_db)) == 2
+
+    assert [row[1] for row in _rows(sqlite_db)] == ['OUTER']
+
+
+def test_nested_transaction_error_rolls_back_inner_only(sqlite_db):
+    """
+    内层异常只回滚到保存点，外层可以继续并提交
+    """
+    with sqlite_db.transaction():
+        sqlite_db.bulk_insert('stock', [{'sku': 'OUTER', 'qty': 1}])
+        with pytest.raises(RuntimeError):
+            with sqlite_db.transaction():
+                sqlite_db.bulk_insert('stock', [{'sku': 'INNER', 'qty': 2}])
+                raise RuntimeError('inner failed')
+        sqlite_db.bulk_insert('stock', [{'sku': 'AFTER', 'qty': 3}])
+
+    assert [row[1] for row in _rows(sqlite_db)] == ['OUTER', 'AFTER']
+
+
+def test_outer_rollback_discards_committed_inner(sqlite_db):
+    """
+    外层rollback=True时，内层已释放的保存点修改也被撤销
+    """
+    with sqlite_db.transaction(rollback=True):
+        with sqlite_db.transaction():
+            sqlite_db.bulk_insert('stock', [{'sku': 'INNER', 'qty': 1}])
+
+    assert _rows(sqlite_db) == []
+
+
+def test_snapshot_skips_views(sqlite_db):
+    """
+    未指定快照表时只快照数据表，不包括视图
+    """
+    sqlite_db.execute("CREATE VIEW stock_view AS SELECT sku FROM stock")
+    sqlite_db.snapshot()
+
+    assert sqlite_db.snapshots == {'default': ['stock']}
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Description: 数据库fixture插件测试，使用pytester在独立会话中执行示例用例
+
+import json
+
+import pytest
+
+from common.db_client import DbClient
+
+pytest_plugins = ['pytester']
+
+
+@pytest.fixture
+def db_url(pytester):
+    url = f"sqlite:///{pytester.path / 'test.db'}"
+    client = DbClient(url)
+    client.execute("CREATE TABLE stock (id INTEGER PRIMARY KEY AUTOINCREMENT, sku TEXT)")
+    client.close()
+    return url
+
+
+def _run(pytester, *args):
+    return pytester.runpytest('-p', 'common.db_plugin', '--db', '-p', 'no:cacheprovider', *args)
+
+
+def test_seed_data_does_not_accumulate_across_sessions(pytester, db_url):
+    """
+    种子数据在每个模块开始时存在，会话结束后恢复到写入种子数据前的状态，重复执行结果一致
+    """
+    seed_file = pytester.path / 'seed.json'
+    seed_file.write_text(json.dumps({'stock': [{'sku': 'A'}, {'sku': 'B'}]}))
+    test_module = """
+        def test_seeded(db):
+            assert db.query("SELECT id, sku FROM stock ORDER BY id") == [(1, 'A'), (2, 'B')]
+            db.bulk_insert('stock', [{'sku': 'C'}])
+    """
+    pytester.makepyfile(test_first=test_module, test_second=test_module)
+
+    for _ in range(2):
+        result = _run(pytester, '--db-url', db_url, '--db-seed', str(seed_file))
+        result.assert_outcomes(passed=2)
+
+    client = DbClient(db_url)
+    try:
+        assert client.query("SELECT COUNT(*) FROM stock") == [(0,)]
+        assert client.tables() == ['stock']
+        client.bulk_insert('stock', [{'sku': 'D'}])
+        assert client.query("SELECT id FROM stock") == [(1,)]
+    finally:
+        client.close()
+
+
+def test_prod_env_requires_explicit_url(pytester, db_url, monkeypatch):
+    """
+    PROD环境下不使用配置中的db_connection，只有显式指定--db-url时才执行
+    """
+    monkeypatch.setenv('TEST_ENV', 'PROD')
+    pytester.makepyfile(test_sample="""
+        def test_uses_db(db):
+            assert db.tables() == ['stock']
+    """)
+
+    result = _run(pytester)
+    result.assert_outcomes(errors=1)
+    result.stdout.fnmatch_lines(['*当前环境为PROD*'])
+
+    _run(pytester, '--db-url', db_url).assert_outcomes(passed=1)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Description: 不稳定用例检测插件测试，使用pytester在独立会话中执行示例用例
+
+import pytest
+
+from common.flaky_plugin import FlakyHistory
+
+pytest_plugins = ['pytester']
+
+
+def _run(pytester, *args):
+    return pytester.runpytest('-p', 'common.flaky_plugin', '--flaky', '-p', 'no:cacheprovider',
+                              '--flaky-db', str(pytester.path / 'history.db'), *args)
+
+
+def test_flaky_test_passes_on_rerun_keeping_module_fixture(pytester):
+    """
+    首次失败、重跑通过的用例结果为passed，module级fixture只创建一次，function级fixture每轮重新创建
+    """
+    pytester.makepyfile(test_sample="""
+        import pytest
+
+        ATTEMPTS = []
+
+        @pytest.fixture(scope='module')
+        def shared():
+            with open('setup.log', 'a') as f:
+                f.write('module\\n')
+            yield
+
+        @pytest.fixture
+        def fresh():
+            with open('setup.log', 'a') as f:
+                f.write('function\\n')
+            yield
+
+        def test_flaky(shared, fresh):
+            ATTEMPTS.append(1)
+            assert len(ATTEMPTS) > 1
+    """)
+
+    result = _run(pytester)
+
+    outcomes = result.parseoutcomes()
+    assert outcomes['passed'] == 1
+    assert outcomes['rerun'] == 1
+    assert 'failed' not in outcomes
+    assert (pytester.path / 'setup.log').read_text().split() == ['module', 'function', 'function']
+
+
+def test_always_failing_test_reports_failed_with_reruns(pytester):
+    """
+    每轮都失败的用例重跑到上限后报告failed，进度中显示R标记
+    """
+    pytester.makepyfile(test_sample="""
+        def test_broken():
+            assert False
+    """)
+
+    result = _run(pytester, '--flaky-reruns', '2')
+
+    outcomes = result.parseoutcomes()
+    assert outcomes['failed'] == 1
+    assert outcomes['rerun'] == 2
+    result.stdout.fnmatch_lines(['test_sample.py RRF*'])
+    assert result.ret == pytest.ExitCode.TESTS_FAILED
+
+
+def test_rerun_uses_api_client_copy(pytester):
+    """
+    重跑时用例得到共享api客户端的副本，cookie保留，共享客户端的会话不被替换
+    """
+    pytester.makeconftest("""
+        import pytest
+        from common.api_client import ApiClient
+
+        @pytest.fixture(scope='session')
+        def api():
+            client = ApiClient({'base_url': 'http://127.0.0.1'})
+            client.session.cookies.set('token', 'abc')
+            return client
+    """)
+    pytester.makepyfile(test_sample="""
+        SEEN = []
+
+        def test_flaky(api):
+            SEEN.append((api, api.session))
+            assert api.session.cookies.get('token') == 'abc'
+            assert len(SEEN) > 1
+
+        def test_after(api):
+            shared, session = SEEN[0]
+            assert SEEN[1][0] is not shared
+            assert SEEN[1][0].session is not session
+            assert api is shared
+            assert api.session is session
+    """)
+
+    result = _run(pytester)
+
+    outcomes = result.parseoutcomes()
+    assert outcomes['passed'] == 2
+    assert outcomes['rerun'] == 1
+
+
+@pytest.mark.parametrize('lane, expected', [('stable', 'test_stable'), ('quarantine', 'test_unstable')])
+def test_lane_deselects_by_history(pytester, lane, expected):
+    """
+    根据历史不稳定分数，stable通道跳过已隔离用例，quarantine通道只执行已隔离用例
+    """
+    pytester.makepyfile(test_sample="""
+        def test_stable():
+            pass
+
+        def test_unstable():
+            pass
+    """)
+    history = FlakyHistory(str(pytester.path / 'history.db'))
+    history.record([('test_sample.py::test_stable', 'passed', 1, 0.1)] * 6)
+    history.record([('test_sample.py::test_unstable', outcome, 1, 0.1)
+                    for outcome in ('passed', 'failed') * 3])
+    history.close()
+
+    result = _run(pytester, '--flaky-lane', lane, '-v')
+
+    result.assert_outcomes(passed=1, deselected=1)
+    result.stdout.fnmatch_lines([f'test_sample.py::{expected} PASSED*'])
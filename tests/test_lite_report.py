@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Description: 轻量级报告测试，使用构造的TestReport写入结果并生成分页数据
+
+import os
+import json
+
+import pytest
+
+from common.lite_report import LiteReportWriter, build_lite_report, DETAIL_CHUNK_SIZE
+
+CAPTURED = [('Captured stdout call', 'output')]
+
+
+def _report(nodeid, when, outcome, longrepr=None, sections=(), **attrs):
+    report = pytest.TestReport(nodeid, (nodeid, 0, nodeid), {}, outcome, longrepr, when,
+                               sections=sections, duration=0.1)
+    for name, value in attrs.items():
+        setattr(report, name, value)
+    return report
+
+
+def _add_test(writer, nodeid, setup=('passed',), call=('passed',), teardown=('passed',), description=''):
+    """
+    写入一个用例的各阶段报告，阶段为None时跳过(如setup失败时没有call阶段)
+    """
+    for when, phase in (('setup', setup), ('call', call), ('teardown', teardown)):
+        if phase is None:
+            continue
+        outcome, *rest = phase
+        attrs = rest[0] if rest else {}
+        longrepr = 'Traceback: boom' if outcome != 'passed' else None
+        sections = CAPTURED if when == 'call' else ()
+        writer.add_report(_report(nodeid, when, outcome, longrepr, sections, description=description, **attrs))
+
+
+def _load_results(report_dir):
+    with open(os.path.join(report_dir, 'results.ndjson'), encoding='utf-8') as f:
+        return {record['nodeid']: record for record in map(json.loads, f)}
+
+
+def _load_js(path):
+    with open(path, encoding='utf-8') as f:
+        content = f.read()
+    return json.loads(content[content.index(',[') + 1:content.rindex(');')])
+
+
+def test_outcome_folding_and_failure_details(tmp_path):
+    """
+    各阶段结果合并为一行，只有失败、错误和重跑的记录保留捕获输出
+    """
+    writer = LiteReportWriter(str(tmp_path))
+    _add_test(writer, 't::passed', description='通过的用例\n详细说明')
+    _add_test(writer, 't::failed', call=('failed',))
+    _add_test(writer, 't::setup_error', setup=('failed',), call=None)
+    _add_test(writer, 't::teardown_error', teardown=('failed',))
+    _add_test(writer, 't::xfailed', call=('skipped', {'wasxfail': 'known bug'}))
+    _add_test(writer, 't::skipped', setup=('skipped',), call=None)
+    _add_test(writer, 't::rerun', call=('rerun',))
+    writer.close()
+
+    results = _load_results(str(tmp_path))
+    assert {nodeid: record['outcome'] for nodeid, record in results.items()} == {
+        't::passed': 'passed',
+        't::failed': 'failed',
+        't::setup_error': 'error',
+        't::teardown_error': 'error',
+        't::xfailed': 'xfailed',
+        't::skipped': 'skipped',
+        't::rerun': 'rerun',
+    }
+
+    assert results['t::passed']['description'] == '通过的用例\n详细说明'
+    assert results['t::failed']['description'] == ''
+    assert 'longrepr' not in results['t::passed']
+    assert 'sections' not in results['t::passed']
+    for nodeid in ('t::failed', 't::teardown_error', 't::rerun'):
+        assert results[nodeid]['longrepr'] == 'Traceback: boom'
+        assert results[nodeid]['sections'] == [list(section) for section in CAPTURED]
+    assert results['t::setup_error']['sections'] == []
+    for nodeid in ('t::xfailed', 't::skipped'):
+        assert 'sections' not in results[nodeid]
+    assert list(results['t::setup_error']['phases']) == ['setup', 'teardown']
+
+
+def test_pages_and_detail_chunks(tmp_path):
+    """
+    结果数超过每页用例数时拆分为多个分页文件，详情按DETAIL_CHUNK_SIZE拆分
+    """
+    total, page_size = 2 * DETAIL_CHUNK_SIZE + 50, 100
+    writer = LiteReportWriter(str(tmp_path))
+    for i in range(total):
+        _add_test(writer, f't::test_{i}', call=('failed',) if i % 10 == 0 else ('passed',),
+                  description=f'用例{i}\n第二行')
+    writer.close()
+
+    index_path = build_lite_report(str(tmp_path), '测试报告', page_size=page_size)
+
+    files = sorted(os.listdir(tmp_path / 'data'))
+    run_pages = [name for name in files if name.startswith('run_')]
+    assert len(run_pages) == 5
+    assert len([name for name in files if name.startswith('duration_')]) == 5
+    assert [name for name in files if name.startswith('failed_')] == ['failed_00000.js']
+    assert [name for name in files if name.startswith('detail_')] == [
+        'detail_00000.js', 'detail_00001.js', 'detail_00002.js']
+
+    last_page = _load_js(tmp_path / 'data' / run_pages[-1])
+    assert len(last_page) == total - 4 * page_size
+    assert last_page[0] == [400, 't::test_400', 'failed', 0.3, '用例400']
+    assert len(_load_js(tmp_path / 'data' / 'failed_00000.js')) == total // 10
+
+    with open(index_path, encoding='utf-8') as f:
+        html = f.read()
+    assert f'"total":{total}' in html
+    assert '"pages":{"run":5,"duration":5,"failed":1}' in html
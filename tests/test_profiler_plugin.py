@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Description: 采样性能分析插件测试
+
+import os
+import re
+import json
+import socket
+import threading
+
+from common.profiler_plugin import SamplingProfiler, PROJECT_ROOT
+
+pytest_plugins = ['pytester']
+
+# 模拟位于用例目录和框架目录中的代码，采样时按文件路径分类
+_FAKE_TEST_FILE = os.path.join(PROJECT_ROOT, 'test_cases', 'test_fake_profile.py')
+_FAKE_FRAMEWORK_FILE = os.path.join(PROJECT_ROOT, 'common', 'fake_profile_helper.py')
+
+
+def _load(source, filename):
+    namespace = {}
+    exec(compile(source, filename, 'exec'), namespace)
+    return namespace
+
+
+_framework = _load('def framework_wait(stop):\n    stop.wait(0.3)\n', _FAKE_FRAMEWORK_FILE)
+_test = _load('def test_sleep(stop):\n    stop.wait(0.3)\n\n'
+              'def test_call_framework(stop):\n    framework_wait(stop)\n', _FAKE_TEST_FILE)
+_test['framework_wait'] = _framework['framework_wait']
+
+
+def _profile(target, *args):
+    """
+    在后台线程中执行target并采样，返回停止后的分析器
+    """
+    thread = threading.Thread(target=target, args=args, daemon=True)
+    thread.start()
+    profiler = SamplingProfiler(interval=0.002, thread_id=thread.ident).start()
+    thread.join()
+    return profiler.stop()
+
+
+def _socket_wait():
+    reader, writer = socket.socketpair()
+    with reader, writer:
+        threading.Timer(0.3, writer.sendall, args=(b'x',)).start()
+        with reader.makefile('rb') as f:
+            f.read(1)
+
+
+def _dominant_category(profiler):
+    # 线程启动和退出时可能采到少量threading内部的栈，只比较耗时最多的分类
+    breakdown = profiler.breakdown()
+    return max(breakdown, key=breakdown.get)
+
+
+def test_socket_wait_is_network():
+    """
+    阻塞在socket读取中的时间归入网络等待
+    """
+    profiler = _profile(_socket_wait)
+
+    assert profiler.samples > 0
+    assert _dominant_category(profiler) == 'network'
+    assert any('readinto (socket.py:' in stack for stack in profiler.stacks)
+
+
+def test_project_code_uses_nearest_frame():
+    """
+    非等待代码按离栈顶最近的项目代码分类: 用例代码中等待归入用例，用例调用的框架代码归入框架
+    """
+    assert _dominant_category(_profile(_test['test_sleep'], threading.Event())) == 'test'
+    assert _dominant_category(_profile(_test['test_call_framework'], threading.Event())) == 'framework'
+
+
+def test_folded_output_format(tmp_path):
+    """
+    折叠栈每行为 "帧;帧;... 次数"，从根帧到栈顶，项目内文件使用相对路径
+    """
+    profiler = _profile(_test['test_call_framework'], threading.Event())
+    path = tmp_path / 'out.folded'
+
+    profiler.write_folded(str(path))
+
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert lines
+    total = 0
+    for line in lines:
+        match = re.fullmatch(r'(.+) (\d+)', line)
+        assert match
+        total += int(match.group(2))
+    assert total == profiler.samples
+
+    frames = lines[0].rsplit(' ', 1)[0].split(';')
+    test_frame = f"test_call_framework ({os.path.join('test_cases', 'test_fake_profile.py')}:4)"
+    framework_frame = f"framework_wait ({os.path.join('common', 'fake_profile_helper.py')}:1)"
+    assert frames.index(test_frame) < frames.index(framework_frame)
+
+
+def test_stale_results_are_cleared(pytester):
+    """
+    启动时清理上次执行留下的火焰图数据和worker汇总
+    """
+    profile_dir = pytester.mkdir('profile')
+    stale = [profile_dir / 'old_test_deadbeef.folded', profile_dir / 'summary_gw3.json']
+    for path in stale:
+        path.write_text('stale')
+    pytester.makepyfile(test_sample="""
+        def test_one():
+            pass
+    """)
+
+    result = pytester.runpytest('-p', 'common.profiler_plugin', '--profile', 'test',
+                                '--profile-dir', str(profile_dir), '-p', 'no:cacheprovider')
+
+    result.assert_outcomes(passed=1)
+    assert not any(path.exists() for path in stale)
+    summary = json.loads((profile_dir / 'summary.json').read_text(encoding='utf-8'))
+    assert list(summary) == ['test_sample.py::test_one']
+    assert sorted(os.listdir(profile_dir)) == sorted([summary['test_sample.py::test_one']['folded'], 'summary.json'])
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Description: 环境预热插件测试
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from common.warmup_plugin import run_warmup, pooled_connections
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'{"status": "ok"}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _CountingServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connections = 0
+
+    def get_request(self):
+        self.connections += 1
+        return super().get_request()
+
+
+@pytest.fixture
+def http_server():
+    server = _CountingServer(('127.0.0.1', 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_warmed_connections_are_reused(http_server):
+    """
+    预热建立的连接保留在连接池中，后续请求不再建立新连接
+    """
+    url = f'http://127.0.0.1:{http_server.server_address[1]}'
+    results, api_client = run_warmup({'api_base_url': url}, timeout=5, connections=4)
+
+    assert all(result.ok for result in results)
+    opened = http_server.connections
+    assert opened >= 1
+    assert pooled_connections(api_client.session, url) == opened
+
+    for _ in range(3):
+        assert api_client.get('/').status_code == 200
+    assert http_server.connections == opened
+
+
+def test_unreachable_host_is_reported(http_server):
+    """
+    地址不可达时检查结果为异常
+    """
+    port = http_server.server_address[1]
+    http_server.shutdown()
+    http_server.server_close()
+    results, _ = run_warmup({'api_base_url': f'http://127.0.0.1:{port}'}, timeout=1, connections=1)
+
+    assert not results[0].ok